@@ -6,383 +6,302 @@ Provides a dockable settings panel for configuring timing thresholds
 and speed parameters for the Quick Brush Size plugin.
 """
 
+import os
+import re
+import weakref
+
 from krita import DockWidget, DockWidgetFactory, DockWidgetFactoryBase
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QSlider, QDoubleSpinBox, QSpinBox,
     QPushButton, QGroupBox, QScrollArea, QSizePolicy,
-    QSpacerItem, QFrame, QApplication, QCheckBox
+    QSpacerItem, QFrame, QApplication, QCheckBox, QWIDGETSIZE_MAX
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QFile, QTextStream, QSignalBlocker
 from PyQt5.QtGui import QPalette, QColor
 
+from . import settings_manager
 from .settings_manager import SettingsManager
 
 
-DOCKER_STYLESHEET = """
-/* Main container */
-QWidget#dockerMain {
-    background-color: palette(window);
-}
-
-/* Scroll area */
-QScrollArea {
-    border: none;
-    background-color: transparent;
-}
-
-QScrollArea > QWidget > QWidget {
-    background-color: transparent;
-}
-
-/* Group boxes - clean, minimal headers */
-QGroupBox {
-    font-weight: bold;
-    font-size: 11px;
-    border: 1px solid palette(mid);
-    border-radius: 4px;
-    margin-top: 12px;
-    padding: 8px 6px 6px 6px;
-    background-color: palette(base);
-}
-
-QGroupBox::title {
-    subcontrol-origin: margin;
-    subcontrol-position: top left;
-    left: 10px;
-    padding: 0 6px;
-    color: palette(text);
-    background-color: palette(base);
-}
-
-/* Labels */
-QLabel {
-    color: palette(text);
-    font-size: 10px;
-}
-
-/* Sliders - thin track */
-QSlider::groove:horizontal {
-    border: none;
-    height: 4px;
-    background: palette(dark);
-    border-radius: 2px;
-}
-
-QSlider::handle:horizontal {
-    background: palette(highlight);
-    border: 1px solid palette(mid);
-    width: 12px;
-    height: 12px;
-    margin: -5px 0;
-    border-radius: 6px;
-}
-
-QSlider::handle:horizontal:hover {
-    background: palette(light);
-    border: 1px solid palette(highlight);
-}
-
-QSlider::handle:horizontal:pressed {
-    background: palette(highlight);
-}
-
-QSlider::sub-page:horizontal {
-    background: palette(highlight);
-    border-radius: 2px;
-}
-
-/* Spin boxes - compact and clean */
-QDoubleSpinBox, QSpinBox {
-    background-color: palette(base);
-    border: 1px solid palette(mid);
-    border-radius: 3px;
-    padding: 2px 4px;
-    color: palette(text);
-    font-size: 10px;
-    selection-background-color: palette(highlight);
-}
-
-QDoubleSpinBox:focus, QSpinBox:focus {
-    border: 1px solid palette(highlight);
-}
-
-QDoubleSpinBox::up-button, QSpinBox::up-button,
-QDoubleSpinBox::down-button, QSpinBox::down-button {
-    width: 14px;
-    border: none;
-    background: palette(button);
-}
-
-QDoubleSpinBox::up-button:hover, QSpinBox::up-button:hover,
-QDoubleSpinBox::down-button:hover, QSpinBox::down-button:hover {
-    background: palette(mid);
-}
-
-QDoubleSpinBox::up-arrow, QSpinBox::up-arrow {
-    image: none;
-    border-left: 4px solid transparent;
-    border-right: 4px solid transparent;
-    border-bottom: 5px solid palette(text);
-    width: 0;
-    height: 0;
-}
-
-QDoubleSpinBox::down-arrow, QSpinBox::down-arrow {
-    image: none;
-    border-left: 4px solid transparent;
-    border-right: 4px solid transparent;
-    border-top: 5px solid palette(text);
-    width: 0;
-    height: 0;
-}
-
-/* Buttons - modern flat style */
-QPushButton {
-    background-color: palette(button);
-    border: 1px solid palette(mid);
-    border-radius: 4px;
-    padding: 5px 12px;
-    color: palette(button-text);
-    font-size: 10px;
-    font-weight: 500;
-    min-height: 20px;
-}
-
-QPushButton:hover {
-    background-color: palette(mid);
-    border: 1px solid palette(dark);
-}
-
-QPushButton:pressed {
-    background-color: palette(dark);
-}
-
-QPushButton#saveBtn {
-    background-color: palette(highlight);
-    color: palette(highlighted-text);
-    border: 1px solid palette(highlight);
-}
-
-QPushButton#saveBtn:hover {
-    background-color: palette(light);
-}
-
-QPushButton#resetBtn {
-    color: palette(text);
-    background-color: transparent;
-    border: 1px solid palette(mid);
-}
-
-QPushButton#resetBtn:hover {
-    background-color: palette(mid);
-}
-
-/* Scrollbar styling */
-QScrollBar:vertical {
-    background: palette(base);
-    width: 8px;
-    border: none;
-    border-radius: 4px;
-}
-
-QScrollBar::handle:vertical {
-    background: palette(mid);
-    border-radius: 4px;
-    min-height: 30px;
-}
-
-QScrollBar::handle:vertical:hover {
-    background: palette(dark);
-}
-
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-    height: 0;
-    border: none;
-}
-
-QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-    background: none;
-}
-
-/* Checkbox styling for threshold toggles */
-QCheckBox {
-    spacing: 4px;
-}
-
-QCheckBox::indicator {
-    width: 14px;
-    height: 14px;
-    border: 1px solid palette(mid);
-    border-radius: 3px;
-    background-color: palette(base);
-}
-
-QCheckBox::indicator:checked {
-    background-color: palette(highlight);
-    border: 1px solid palette(highlight);
-}
-
-QCheckBox::indicator:hover {
-    border: 1px solid palette(highlight);
-}
-
-QCheckBox::indicator:disabled {
-    background-color: palette(mid);
-    border: 1px solid palette(dark);
-}
-"""
+# Delay before a live edit is pushed to the settings manager (ms).
+# Slider drags emit a value per tick; only the value the user settles on
+# needs to reach the handlers.
+LIVE_UPDATE_DELAY_MS = 150
+
+# Size policies shared by every setting row
+_LABEL_SIZE_POLICY = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+_SLIDER_SIZE_POLICY = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+
+# Slider scale per number of decimals (sliders only work with integers)
+_SLIDER_SCALES = (1, 10, 100, 1000, 10000, 100000)
+
+# DOCKER_STYLESHEET with palette() references resolved for the current
+# theme, shared by every docker (None until the first docker is built)
+_resolved_stylesheet = None
+
+# Main widgets of the live dockers, restyled when the theme changes
+_styled_widgets = weakref.WeakSet()
+
+# Matches palette(role) references in the stylesheet
+_PALETTE_REF = re.compile(r"palette\(([\w-]+)\)")
+
+
+def _load_stylesheet(file_name):
+    """Read a stylesheet shipped next to this module (empty if missing)."""
+    qss_file = QFile(os.path.join(os.path.dirname(__file__), file_name))
+    if not qss_file.open(QFile.ReadOnly | QFile.Text):
+        return ""
+    try:
+        stream = QTextStream(qss_file)
+        stream.setCodec("UTF-8")
+        return stream.readAll()
+    finally:
+        qss_file.close()
+
+
+def _minify_stylesheet(css):
+    """Strip comments and redundant whitespace so Qt has less to tokenize."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
 
+# Docker styling lives in docker.qss (the readable source); Qt gets the
+# minified form
+DOCKER_STYLESHEET = _minify_stylesheet(_load_stylesheet("docker.qss"))
 
-class SettingRow(QWidget):
+
+def _resolve_palette_colors(css, palette):
+    """Replace palette(role) references with the palette's concrete colors."""
+    colors = {}
+    
+    def color_for(match):
+        role = match.group(1)
+        if role not in colors:
+            # e.g. "highlighted-text" -> QPalette.HighlightedText
+            role_name = "".join(part.capitalize() for part in role.split("-"))
+            color_role = getattr(QPalette, role_name, None)
+            if color_role is None:
+                return match.group(0)
+            colors[role] = palette.color(color_role).name()
+        return colors[role]
+    
+    return _PALETTE_REF.sub(color_for, css)
+
+
+def _apply_docker_stylesheet(widget):
     """
-    A single setting row with label, slider, and spin box.
+    Set the palette-resolved DOCKER_STYLESHEET on a docker's main widget.
     
-    Supports both float (QDoubleSpinBox) and int (QSpinBox) values.
+    The processed string is built once per theme and shared by every
+    docker. The application stylesheet is never touched, so the rest of
+    Krita keeps its style.
     """
+    global _resolved_stylesheet
+    if _resolved_stylesheet is None:
+        app = QApplication.instance()
+        _resolved_stylesheet = _resolve_palette_colors(DOCKER_STYLESHEET, app.palette())
+        app.paletteChanged.connect(_on_palette_changed)
+    widget.setStyleSheet(_resolved_stylesheet)
+    _styled_widgets.add(widget)
+
+
+def _on_palette_changed(palette):
+    """Re-resolve the docker colors after a theme (palette) change."""
+    global _resolved_stylesheet
+    stylesheet = _resolve_palette_colors(DOCKER_STYLESHEET, palette)
+    if stylesheet == _resolved_stylesheet:
+        return
     
-    def __init__(self, key, meta, settings_manager, parent=None):
-        super().__init__(parent)
-        
-        self.key = key
-        self.settings_manager = settings_manager
-        
-        # Unpack metadata
-        self.display_name, self.min_val, self.max_val, self.decimals, self.step, self.tooltip = meta
-        
-        # Determine if this is an integer setting
-        self.is_integer = (self.decimals == 0)
-        
-        # Build UI
-        self._setup_ui()
-        
-        # Load initial value
-        self._load_value()
+    _resolved_stylesheet = stylesheet
+    for widget in list(_styled_widgets):
+        widget.setStyleSheet(stylesheet)
+
+
+class _ScaledSpinSliderMixin:
+    """
+    Shared label + slider + spin box behaviour for setting rows.
     
-    def _setup_ui(self):
-        """Set up the UI elements for this setting row."""
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 1, 0, 1)
-        layout.setSpacing(6)
-        
+    The slider works on integers, so float values are scaled by
+    slider_scale (10 ** decimals); integer settings use a scale of 1.
+    Expects key, settings_manager, display_name, min_val, max_val,
+    decimals, step, tooltip and is_integer to be set on the row.
+    """
+    
+    def _setup_value_widgets(self, layout):
+        """Create the label, slider and spin box and add them to layout."""
         # Label - compact width
         self.label = QLabel(self.display_name)
         self.label.setToolTip(self.tooltip)
-        self.label.setMinimumWidth(120)
-        self.label.setMaximumWidth(140)
-        self.label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        self.label.setMinimumSize(120, 0)
+        self.label.setMaximumSize(140, QWIDGETSIZE_MAX)
+        self.label.setSizePolicy(_LABEL_SIZE_POLICY)
         layout.addWidget(self.label)
         
         # Slider - thin track
         self.slider = QSlider(Qt.Horizontal)
         self.slider.setToolTip(self.tooltip)
-        self.slider.setMinimumWidth(80)
-        self.slider.setMinimumHeight(16)
-        self.slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        
-        # Configure slider range (use integer steps for slider)
-        if self.is_integer:
-            self.slider.setMinimum(int(self.min_val))
-            self.slider.setMaximum(int(self.max_val))
-            self.slider.setSingleStep(int(self.step))
-        else:
-            # For floats, use scaled integer range
-            self.slider_scale = 10 ** self.decimals
-            self.slider.setMinimum(int(self.min_val * self.slider_scale))
-            self.slider.setMaximum(int(self.max_val * self.slider_scale))
-            self.slider.setSingleStep(int(self.step * self.slider_scale))
+        self.slider.setMinimumSize(80, 16)
+        self.slider.setSizePolicy(_SLIDER_SIZE_POLICY)
+        
+        # Configure slider range (use integer steps for slider; floats are
+        # scaled, integers use a scale of 1)
+        self.slider_scale = _SLIDER_SCALES[self.decimals]
+        slider_min = int(self.min_val * self.slider_scale)
+        slider_max = int(self.max_val * self.slider_scale)
+        slider_step = int(self.step * self.slider_scale)
+        self.slider.setRange(slider_min, slider_max)
+        self.slider.setSingleStep(slider_step)
         
         layout.addWidget(self.slider)
         
         # Spin box (double or int)
         if self.is_integer:
+            # Integer range is the unscaled slider range
             self.spinbox = QSpinBox()
-            self.spinbox.setMinimum(int(self.min_val))
-            self.spinbox.setMaximum(int(self.max_val))
-            self.spinbox.setSingleStep(int(self.step))
+            self.spinbox.setRange(slider_min, slider_max)
+            self.spinbox.setSingleStep(slider_step)
         else:
             self.spinbox = QDoubleSpinBox()
-            self.spinbox.setMinimum(self.min_val)
-            self.spinbox.setMaximum(self.max_val)
-            self.spinbox.setSingleStep(self.step)
             self.spinbox.setDecimals(self.decimals)
+            self.spinbox.setRange(self.min_val, self.max_val)
+            self.spinbox.setSingleStep(self.step)
         
         self.spinbox.setToolTip(self.tooltip)
-        self.spinbox.setMinimumWidth(60)
-        self.spinbox.setMaximumWidth(75)
-        self.spinbox.setFixedHeight(22)
+        self.spinbox.setMinimumSize(60, 22)
+        self.spinbox.setMaximumSize(75, 22)
+        # Only emit valueChanged for typed input once the edit is committed
+        # (Enter or focus out) rather than on every keystroke
+        self.spinbox.setKeyboardTracking(False)
         layout.addWidget(self.spinbox)
         
-        # Connect signals
+        # Connect signals. With tracking off the slider emits valueChanged
+        # only when a drag is released (or on keyboard/wheel steps), while
+        # sliderMoved reports the drag position for the spin box mirror.
+        self.slider.setTracking(False)
+        self.slider.sliderMoved.connect(self._on_slider_moved)
         self.slider.valueChanged.connect(self._on_slider_changed)
         self.spinbox.valueChanged.connect(self._on_spinbox_changed)
         
-        # Flag to prevent circular updates
-        self._updating = False
-    
-    def _load_value(self):
-        """Load the current value from settings."""
-        value = self.settings_manager.get(self.key)
-        self.set_value(value)
+        # Debounce live updates so a drag results in a single settings write
+        self._pending_value = None
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(LIVE_UPDATE_DELAY_MS)
+        self._debounce.timeout.connect(self._flush)
     
     def set_value(self, value):
         """Set the displayed value without triggering settings update."""
-        self._updating = True
-        try:
-            if self.is_integer:
-                self.slider.setValue(int(value))
-                self.spinbox.setValue(int(value))
-            else:
-                self.slider.setValue(int(value * self.slider_scale))
-                self.spinbox.setValue(float(value))
-        finally:
-            self._updating = False
+        # Any queued edit is superseded by the value being displayed
+        self._debounce.stop()
+        self._pending_value = None
+        with QSignalBlocker(self.slider), QSignalBlocker(self.spinbox):
+            self.slider.setValue(int(value * self.slider_scale))
+            self.spinbox.setValue(int(value) if self.is_integer else float(value))
     
     def get_value(self):
         """Get the current value."""
+        return self.spinbox.value()
+    
+    def _on_slider_moved(self, position):
+        """Mirror the slider position in the spin box while dragging."""
         if self.is_integer:
-            return self.spinbox.value()
+            actual_value = position
         else:
-            return self.spinbox.value()
+            actual_value = position / self.slider_scale
+        
+        with QSignalBlocker(self.spinbox):
+            self.spinbox.setValue(actual_value)
+        return actual_value
     
     def _on_slider_changed(self, value):
         """Handle slider value change."""
-        if self._updating:
-            return
+        actual_value = self._on_slider_moved(value)
         
-        self._updating = True
-        try:
-            if self.is_integer:
-                actual_value = value
-                self.spinbox.setValue(value)
-            else:
-                actual_value = value / self.slider_scale
-                self.spinbox.setValue(actual_value)
-            
-            # Update settings (live)
-            self.settings_manager.set(self.key, actual_value)
-        finally:
-            self._updating = False
+        # Update settings (live, debounced)
+        self._schedule_update(actual_value)
     
     def _on_spinbox_changed(self, value):
         """Handle spinbox value change."""
-        if self._updating:
+        with QSignalBlocker(self.slider):
+            self.slider.setValue(int(value * self.slider_scale))
+        
+        # Update settings (live, debounced)
+        self._schedule_update(value)
+    
+    def _schedule_update(self, value):
+        """Queue a live settings update, restarting the debounce timer."""
+        self._pending_value = value
+        self._debounce.start()
+    
+    def _flush(self):
+        """Push the pending value to the settings manager."""
+        if self._pending_value is None:
             return
+        value = self._pending_value
+        self._pending_value = None
         
-        self._updating = True
-        try:
-            if self.is_integer:
-                self.slider.setValue(int(value))
-            else:
-                self.slider.setValue(int(value * self.slider_scale))
-            
-            # Update settings (live)
-            self.settings_manager.set(self.key, value)
-        finally:
-            self._updating = False
+        # set() ignores values equal to the current one, so quantized slider
+        # steps that land on the applied value don't refresh the handlers
+        self.settings_manager.set(self.key, value)
+    
+    def take_pending_value(self):
+        """
+        Cancel the queued live update and return its value (None if none).
+        
+        Lets the docker apply pending edits from all rows in one batch.
+        """
+        self._debounce.stop()
+        value = self._pending_value
+        self._pending_value = None
+        return value
+
+
+class SettingRow(_ScaledSpinSliderMixin, QWidget):
+    """
+    A single setting row with label, slider, and spin box.
+    
+    Supports both float (QDoubleSpinBox) and int (QSpinBox) values.
+    """
+    
+    def __init__(self, key, meta, settings_manager, parent=None):
+        super().__init__(parent)
+        
+        self.key = key
+        self.settings_manager = settings_manager
+        
+        # Unpack metadata
+        self.display_name, self.min_val, self.max_val, self.decimals, self.step, self.tooltip = meta
+        
+        # Determine if this is an integer setting
+        self.is_integer = (self.decimals == 0)
+        
+        # Build UI
+        self._setup_ui()
+        
+        # Load initial value
+        self._load_value()
+    
+    def _setup_ui(self):
+        """Set up the UI elements for this setting row."""
+        # Layout is installed once populated, so adding widgets doesn't
+        # invalidate a live layout each time
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 1, 0, 1)
+        layout.setSpacing(6)
+        
+        self._setup_value_widgets(layout)
+        self.setLayout(layout)
+    
+    def _load_value(self):
+        """Load the current value from settings."""
+        value = self.settings_manager.get(self.key)
+        self.set_value(value)
 
 
-class ThresholdSettingRow(QWidget):
+class ThresholdSettingRow(_ScaledSpinSliderMixin, QWidget):
     """
     A threshold setting row with checkbox toggle, label, slider, and spin box.
     
@@ -411,7 +330,7 @@ class ThresholdSettingRow(QWidget):
     
     def _setup_ui(self):
         """Set up the UI elements for this threshold row."""
-        layout = QHBoxLayout(self)
+        layout = QHBoxLayout()
         layout.setContentsMargins(0, 1, 0, 1)
         layout.setSpacing(6)
         
@@ -422,48 +341,8 @@ class ThresholdSettingRow(QWidget):
         self.checkbox.stateChanged.connect(self._on_checkbox_changed)
         layout.addWidget(self.checkbox)
         
-        # Label - compact width
-        self.label = QLabel(self.display_name)
-        self.label.setToolTip(self.tooltip)
-        self.label.setMinimumWidth(120)
-        self.label.setMaximumWidth(140)
-        self.label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
-        layout.addWidget(self.label)
-        
-        # Slider
-        self.slider = QSlider(Qt.Horizontal)
-        self.slider.setToolTip(self.tooltip)
-        self.slider.setMinimumWidth(80)
-        self.slider.setMinimumHeight(16)
-        self.slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        
-        # For floats, use scaled integer range
-        self.slider_scale = 10 ** self.decimals
-        self.slider.setMinimum(int(self.min_val * self.slider_scale))
-        self.slider.setMaximum(int(self.max_val * self.slider_scale))
-        self.slider.setSingleStep(int(self.step * self.slider_scale))
-        
-        layout.addWidget(self.slider)
-        
-        # Spin box (double for thresholds)
-        self.spinbox = QDoubleSpinBox()
-        self.spinbox.setMinimum(self.min_val)
-        self.spinbox.setMaximum(self.max_val)
-        self.spinbox.setSingleStep(self.step)
-        self.spinbox.setDecimals(self.decimals)
-        
-        self.spinbox.setToolTip(self.tooltip)
-        self.spinbox.setMinimumWidth(60)
-        self.spinbox.setMaximumWidth(75)
-        self.spinbox.setFixedHeight(22)
-        layout.addWidget(self.spinbox)
-        
-        # Connect signals
-        self.slider.valueChanged.connect(self._on_slider_changed)
-        self.spinbox.valueChanged.connect(self._on_spinbox_changed)
-        
-        # Flag to prevent circular updates
-        self._updating = False
+        self._setup_value_widgets(layout)
+        self.setLayout(layout)
     
     def _load_value(self):
         """Load the current value from settings."""
@@ -472,31 +351,15 @@ class ThresholdSettingRow(QWidget):
         self.set_value(value)
         self.set_enabled_state(enabled)
     
-    def set_value(self, value):
-        """Set the displayed value without triggering settings update."""
-        self._updating = True
-        try:
-            self.slider.setValue(int(value * self.slider_scale))
-            self.spinbox.setValue(float(value))
-        finally:
-            self._updating = False
-    
-    def get_value(self):
-        """Get the current value."""
-        return self.spinbox.value()
-    
     def is_checked(self):
         """Return whether the checkbox is checked."""
         return self.checkbox.isChecked()
     
     def set_enabled_state(self, enabled):
         """Set the enabled/checked state of this threshold."""
-        self._updating = True
-        try:
+        with QSignalBlocker(self.checkbox):
             self.checkbox.setChecked(enabled)
-            self._update_controls_enabled(enabled)
-        finally:
-            self._updating = False
+        self._update_controls_enabled(enabled)
     
     def _update_controls_enabled(self, enabled):
         """Enable or disable the slider and spinbox based on checkbox state."""
@@ -506,9 +369,6 @@ class ThresholdSettingRow(QWidget):
     
     def _on_checkbox_changed(self, state):
         """Handle checkbox state change."""
-        if self._updating:
-            return
-        
         is_checked = state == Qt.Checked
         
         # Check if this would leave no thresholds enabled
@@ -516,43 +376,13 @@ class ThresholdSettingRow(QWidget):
             enabled_count = self.settings_manager.get_enabled_threshold_count()
             if enabled_count <= 1:
                 # Can't uncheck the last one - revert
-                self._updating = True
-                self.checkbox.setChecked(True)
-                self._updating = False
+                with QSignalBlocker(self.checkbox):
+                    self.checkbox.setChecked(True)
                 return
         
         # Update the enabled state
         self._update_controls_enabled(is_checked)
         self.settings_manager.set_threshold_enabled(self.key, is_checked)
-    
-    def _on_slider_changed(self, value):
-        """Handle slider value change."""
-        if self._updating:
-            return
-        
-        self._updating = True
-        try:
-            actual_value = value / self.slider_scale
-            self.spinbox.setValue(actual_value)
-            
-            # Update settings (live)
-            self.settings_manager.set(self.key, actual_value)
-        finally:
-            self._updating = False
-    
-    def _on_spinbox_changed(self, value):
-        """Handle spinbox value change."""
-        if self._updating:
-            return
-        
-        self._updating = True
-        try:
-            self.slider.setValue(int(value * self.slider_scale))
-            
-            # Update settings (live)
-            self.settings_manager.set(self.key, value)
-        finally:
-            self._updating = False
 
 
 class QuickBrushSizeDocker(DockWidget):
@@ -576,7 +406,7 @@ class QuickBrushSizeDocker(DockWidget):
         self.setWindowTitle(self.DOCKER_TITLE)
         
         # Get settings manager
-        self.settings_manager = SettingsManager.instance()
+        self.settings_manager = settings_manager.instance()
         
         # Store setting rows for bulk updates
         self.setting_rows = {}
@@ -584,6 +414,9 @@ class QuickBrushSizeDocker(DockWidget):
         # Store threshold rows separately for toggle handling
         self.threshold_rows = {}
         
+        # Setting groups are built on first show (see showEvent)
+        self._groups_built = False
+        
         # Build the UI
         self._setup_ui()
     
@@ -593,8 +426,8 @@ class QuickBrushSizeDocker(DockWidget):
         main_widget.setObjectName("dockerMain")
         self.setWidget(main_widget)
         
-        # Apply the sleek stylesheet
-        main_widget.setStyleSheet(DOCKER_STYLESHEET)
+        # Apply the sleek stylesheet (matched via objectName)
+        _apply_docker_stylesheet(main_widget)
         
         # Scroll area for content
         scroll = QScrollArea()
@@ -608,10 +441,13 @@ class QuickBrushSizeDocker(DockWidget):
         content_layout.setContentsMargins(6, 6, 6, 6)
         content_layout.setSpacing(8)
         
-        # Create groups for each category
-        for group_name, setting_keys in SettingsManager.SETTING_GROUPS.items():
-            group = self._create_setting_group(group_name, setting_keys)
-            content_layout.addWidget(group)
+        # Placeholder for the setting groups, filled in on first show so a
+        # hidden docker doesn't build every row during Krita startup
+        groups_widget = QWidget()
+        self._groups_layout = QVBoxLayout(groups_widget)
+        self._groups_layout.setContentsMargins(0, 0, 0, 0)
+        self._groups_layout.setSpacing(8)
+        content_layout.addWidget(groups_widget)
         
         # Add stretch to push groups to top
         content_layout.addStretch()
@@ -627,37 +463,53 @@ class QuickBrushSizeDocker(DockWidget):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(scroll)
     
+    def showEvent(self, event):
+        """Build the setting groups the first time the docker is shown."""
+        if not self._groups_built:
+            self._build_groups()
+        super().showEvent(event)
+    
+    def _build_groups(self):
+        """Create groups for each category."""
+        self._groups_built = True
+        for group_name, setting_keys in SettingsManager.SETTING_GROUPS.items():
+            group = self._create_setting_group(group_name, setting_keys)
+            self._groups_layout.addWidget(group)
+    
     def _create_setting_group(self, group_name, setting_keys):
         """Create a group box with settings for a specific mode."""
         group = QGroupBox(group_name)
-        layout = QVBoxLayout(group)
+        layout = QVBoxLayout()
         layout.setContentsMargins(8, 16, 8, 8)
         layout.setSpacing(2)
         
         # Check if this is the Timing Thresholds group (uses ThresholdSettingRow)
         is_threshold_group = (group_name == "Timing Thresholds")
         
+        meta_table = SettingsManager.SETTING_META
         for key in setting_keys:
-            if key in SettingsManager.SETTING_META:
-                meta = SettingsManager.SETTING_META[key]
-                
-                if is_threshold_group:
-                    # Use ThresholdSettingRow with checkbox for thresholds
-                    row = ThresholdSettingRow(key, meta, self.settings_manager, self)
-                    self.threshold_rows[key] = row
-                else:
-                    # Use regular SettingRow for other settings
-                    row = SettingRow(key, meta, self.settings_manager)
-                
-                self.setting_rows[key] = row
-                layout.addWidget(row)
+            meta = meta_table.get(key)
+            if meta is None:
+                continue
+            
+            if is_threshold_group:
+                # Use ThresholdSettingRow with checkbox for thresholds
+                row = ThresholdSettingRow(key, meta, self.settings_manager, self)
+                self.threshold_rows[key] = row
+            else:
+                # Use regular SettingRow for other settings
+                row = SettingRow(key, meta, self.settings_manager)
+            
+            self.setting_rows[key] = row
+            layout.addWidget(row)
         
+        group.setLayout(layout)
         return group
     
     def _create_button_row(self):
         """Create the bottom button row with styled buttons."""
         button_widget = QWidget()
-        layout = QHBoxLayout(button_widget)
+        layout = QHBoxLayout()
         layout.setContentsMargins(0, 12, 0, 4)
         layout.setSpacing(6)
         
@@ -685,6 +537,7 @@ class QuickBrushSizeDocker(DockWidget):
         self.cancel_btn.clicked.connect(self._on_cancel_clicked)
         layout.addWidget(self.cancel_btn)
         
+        button_widget.setLayout(layout)
         return button_widget
     
     def _on_reset_clicked(self):
@@ -694,6 +547,15 @@ class QuickBrushSizeDocker(DockWidget):
     
     def _on_save_clicked(self):
         """Handle Save button click."""
+        # Make sure edits still waiting on the debounce are included,
+        # applied as one batch so handlers refresh only once
+        pending = {}
+        for key, row in self.setting_rows.items():
+            value = row.take_pending_value()
+            if value is not None:
+                pending[key] = value
+        if pending:
+            self.settings_manager.set_many(pending)
         self.settings_manager.save()
     
     def _on_cancel_clicked(self):
@@ -703,14 +565,23 @@ class QuickBrushSizeDocker(DockWidget):
     
     def _update_all_rows(self):
         """Update all setting rows to reflect current settings."""
-        for key, row in self.setting_rows.items():
-            value = self.settings_manager.get(key)
-            row.set_value(value)
+        # Read every value in one call instead of one lookup per row
+        values = self.settings_manager.get_all()
         
-        # Also update threshold enabled states
-        for key, row in self.threshold_rows.items():
-            enabled = self.settings_manager.is_threshold_enabled(key)
-            row.set_enabled_state(enabled)
+        # Rows block their own signals while updating; also hold repaints
+        # so the whole docker refreshes in one pass
+        main_widget = self.widget()
+        main_widget.setUpdatesEnabled(False)
+        try:
+            for key, row in self.setting_rows.items():
+                row.set_value(values[key])
+            
+            # Also update threshold enabled states
+            toggle_map = SettingsManager.THRESHOLD_TOGGLE_MAP
+            for key, row in self.threshold_rows.items():
+                row.set_enabled_state(values[toggle_map[key]])
+        finally:
+            main_widget.setUpdatesEnabled(True)
     
     def canvasChanged(self, canvas):
         """Called when the canvas changes. Required by DockWidget."""
@@ -18,18 +18,23 @@ Modes can be individually enabled/disabled via thresholds in the docker.
 """
 
 from krita import Extension, Krita
-from PyQt5.QtCore import QTimer
-from math import exp
+from PyQt5.QtCore import QTimer, QElapsedTimer, Qt
+from math import exp, ceil, log
 import time
-from enum import Enum
 
-from .settings_manager import SettingsManager
+from . import settings_manager
+from .settings_manager import SettingsManager, SettingsSnapshot
 
 
-class InputMode(Enum):
-    """Input modes detected in real-time based on user behavior."""
-    HOLD = "hold"            # Key held down - exponential acceleration
-    SLOW_TAP = "slow_tap"    # Taps - burst of presses per tap
+class InputMode:
+    """
+    Input modes detected in real-time based on user behavior.
+    
+    Plain int constants rather than an Enum, since the mode is compared on
+    every timer tick.
+    """
+    HOLD = 1        # Key held down - exponential acceleration
+    SLOW_TAP = 2    # Taps - burst of presses per tap
 
 
 class AcceleratingKeyHandler:
@@ -52,67 +57,158 @@ class AcceleratingKeyHandler:
     MAX_UNCHANGED_TRIGGERS = 15  # Stop if brush size unchanged after this many triggers
     MIN_BRUSH_SIZE = 1.0         # Minimum brush size in pixels
     
+    # Safety limits in integer nanoseconds for comparisons against self._clock
+    _MAX_PRESS_NS = int(MAX_PRESS_DURATION * 1e9)
+    _STALE_NS = int(STALE_STATE_TIMEOUT * 1e9)
+    
+    # Time resolution of the precomputed HOLD interval curve: at most 1ms,
+    # and finer for steep curves so a lookup (which rounds down to the
+    # previous entry) is never more than DECAY_TABLE_MAX_ERROR too long
+    DECAY_TABLE_STEP = 0.001
+    DECAY_TABLE_MAX_ERROR = 0.05
+    
+    # What the shared timer is currently driving (see _on_timer)
+    _TIMER_IDLE = 0
+    _TIMER_BURST = 1
+    _TIMER_HOLD = 2
+    
     def __init__(self, action_name: str):
         self.action_name = action_name
         
-        # === Configurable Settings (set by SettingsManager) ===
-        # Timing Thresholds
-        self.HOLD_DETECT_TIME = 0.035
-        self.SLOW_TAP_THRESHOLD = 0.30
-        self.MULTIPLIER_THRESHOLD = 0.15
-        
-        # Mode Enabled States
-        self.HOLD_ENABLED = True
-        self.SLOW_TAP_ENABLED = True
-        self.MULTIPLIER_ENABLED = True
+        # === Configurable Settings (replaced by SettingsManager) ===
+        # Timing thresholds, mode enabled states, HOLD and TAP parameters,
+        # read as self.settings.HOLD_DETECT_TIME etc. Starts at the defaults.
+        self.settings = SettingsSnapshot.from_settings(SettingsManager.DEFAULTS)
         
-        # HOLD Mode Parameters
-        self.HOLD_BASE_INTERVAL = 0.10
-        self.HOLD_MIN_INTERVAL = 0.008
-        self.HOLD_EXP_K = 8.0
-        self.HOLD_TAU = 0.15
+        # Settings packed into tuples so each use is one attribute read
+        # (rebuilt whenever settings change)
+        self._hold_params = ()
+        self._tap_params = ()
+        self._rebuild_params()
         
-        # TAP Mode Parameters (burst-based)
-        self.SLOW_BURST_COUNT = 3
-        self.SLOW_BURST_INTERVAL = 0.015
+        # Precomputed HOLD intervals (rebuilt whenever settings change)
+        self._decay_table = []
+        self._decay_step = self.DECAY_TABLE_STEP
+        self._rebuild_decay_table()
         
-        # MULTIPLIER Parameters
-        self.MULTIPLIER_BURST_COUNT = 2      # Multiplier for burst count
-        self.MULTIPLIER_BURST_INTERVAL = 0.010  # Faster interval when multiplied
+        # Timing thresholds in integer nanoseconds (rebuilt whenever settings change)
+        self._HOLD_DETECT_NS = 0
+        self._SLOW_TAP_THRESHOLD_NS = 0
+        self._MULTIPLIER_THRESHOLD_NS = 0
+        self._rebuild_thresholds_ns()
         
         # === State Tracking ===
+        # Monotonic clock for all timestamps below, in ns since the handler was created
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        
         self.is_pressed = False
-        self.press_start_time = 0
-        self.last_trigger_time = 0
-        self.last_release_time = 0
+        self.press_start_ns = 0
+        self.last_trigger_ns = 0
+        self.last_release_ns = 0
         self.trigger_count = 0
         
         # Current detected mode
         self.current_mode = InputMode.SLOW_TAP
         
+        # Repeat interval for the current mode, as a function of elapsed
+        # seconds (specialized to the current settings on entering HOLD)
+        self._interval_fn = self._tap_interval
+        
         # Burst mode state
         self.burst_remaining = 0
         self.burst_active = False  # True while a burst is in progress
-        self.burst_timer = QTimer()
-        self.burst_timer.timeout.connect(self._on_burst_timer)
-        self.burst_timer.setSingleShot(True)
         
         # Current burst settings (set per burst based on mode)
         self._current_burst_interval = 0.015
+        self._current_burst_interval_ms = 15  # Same interval, as QTimer milliseconds
         
-        # Hold mode timer
+        # Single repeating timer shared by bursts and hold detection, which
+        # never run at the same time; _timer_state says which one it drives
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)  # HOLD schedules each tick for the next trigger
         self.timer.timeout.connect(self._on_timer)
         self.timer_interval = 5  # 5ms polling for responsiveness
+        self._timer_state = self._TIMER_IDLE
         
         # === Safety Tracking ===
         self.last_brush_size = None           # Track brush size to detect when it stops changing
         self.unchanged_trigger_count = 0      # Count triggers with no size change
-        self.last_timer_activity = 0          # Track timer activity for stale state detection
+        self.last_timer_activity_ns = 0       # Track timer activity for stale state detection
+        self._last_size_after = None          # Size read after the previous safety-checked trigger
+        self._size_check_stride = 1           # Read the size every Nth trigger (widened near a clamp)
+        self._triggers_since_size_check = 0   # Triggers since the size was last read
+        
+        # Krita objects looked up once per press (cleared in _cleanup_state)
+        self._cached_view = None
+        self._cached_action = None
         
         # Reference to paired handler (set by extension for mutual exclusion)
         self.paired_handler = None
     
+    def on_settings_changed(self):
+        """Called by SettingsManager after it has applied new settings."""
+        self._rebuild_params()
+        self._rebuild_decay_table()
+        self._rebuild_thresholds_ns()
+        if self.current_mode == InputMode.HOLD:
+            self._interval_fn = self._make_hold_interval_fn()
+    
+    def _rebuild_params(self):
+        """
+        Pack the HOLD and TAP settings into immutable tuples.
+        
+        _hold_params: (base_interval, min_interval, k / tau, detect_time)
+        _tap_params: (burst_count, burst_interval,
+                      multiplied_burst_count, multiplied_burst_interval)
+        """
+        settings = self.settings
+        self._hold_params = (
+            settings.HOLD_BASE_INTERVAL,
+            settings.HOLD_MIN_INTERVAL,
+            settings.HOLD_EXP_K / settings.HOLD_TAU,
+            settings.HOLD_DETECT_TIME,
+        )
+        self._tap_params = (
+            settings.SLOW_BURST_COUNT,
+            settings.SLOW_BURST_INTERVAL,
+            settings.SLOW_BURST_COUNT * settings.MULTIPLIER_BURST_COUNT,
+            settings.MULTIPLIER_BURST_INTERVAL,
+        )
+    
+    def _rebuild_thresholds_ns(self):
+        """Convert the configurable timing thresholds to integer nanoseconds."""
+        settings = self.settings
+        self._HOLD_DETECT_NS = int(settings.HOLD_DETECT_TIME * 1e9)
+        self._SLOW_TAP_THRESHOLD_NS = int(settings.SLOW_TAP_THRESHOLD * 1e9)
+        self._MULTIPLIER_THRESHOLD_NS = int(settings.MULTIPLIER_THRESHOLD * 1e9)
+    
+    def _rebuild_decay_table(self):
+        """
+        Precompute the HOLD interval curve for the current settings.
+        
+        Entry i holds base * e^(-k * t / tau) for t = i * _decay_step.
+        The step is DECAY_TABLE_STEP, shortened when k / tau is steep enough
+        that an entry would exceed the interval one step later by more than
+        DECAY_TABLE_MAX_ERROR. The table stops where the curve reaches
+        HOLD_MIN_INTERVAL (or at MAX_PRESS_DURATION), so any index past its
+        end means the minimum interval.
+        """
+        base, min_interval, k_over_tau, _ = self._hold_params
+        step = self.DECAY_TABLE_STEP
+        if k_over_tau > 0:
+            step = min(step, log(1.0 + self.DECAY_TABLE_MAX_ERROR) / k_over_tau)
+        self._decay_step = step
+        max_entries = int(self.MAX_PRESS_DURATION / step) + 1
+        
+        table = []
+        for i in range(max_entries):
+            interval = base * exp(-k_over_tau * i * step)
+            if interval <= min_interval:
+                break
+            table.append(interval)
+        self._decay_table = table
+    
     def start_press(self):
         """Called when the key is initially pressed."""
         if self.is_pressed:
@@ -124,25 +220,29 @@ class AcceleratingKeyHandler:
             self.paired_handler.force_stop("paired handler starting")
         
         self.is_pressed = True
-        self.press_start_time = time.time()
-        self.last_trigger_time = self.press_start_time
+        self._cache_krita_objects()
+        self.press_start_ns = self._clock.nsecsElapsed()
+        self.last_trigger_ns = self.press_start_ns
         self.trigger_count = 0
         
         # === Reset safety counters ===
         self.last_brush_size = self._get_current_brush_size()
         self.unchanged_trigger_count = 0
-        self.last_timer_activity = self.press_start_time
+        self._last_size_after = None
+        self._size_check_stride = 1
+        self._triggers_since_size_check = 0
+        self.last_timer_activity_ns = self.press_start_ns
         
         # Classify tap type based on time since last release
-        time_since_release = self.press_start_time - self.last_release_time
+        ns_since_release = self.press_start_ns - self.last_release_ns
         
         # Determine if this is a tap (possibly with multiplier)
-        if self.SLOW_TAP_ENABLED and (self.last_release_time == 0 or time_since_release < self.SLOW_TAP_THRESHOLD):
+        if self.settings.SLOW_TAP_ENABLED and (self.last_release_ns == 0 or ns_since_release < self._SLOW_TAP_THRESHOLD_NS):
             # Check if multiplier should be applied (quick succession)
             use_multiplier = (
-                self.MULTIPLIER_ENABLED and 
-                self.last_release_time > 0 and 
-                time_since_release < self.MULTIPLIER_THRESHOLD
+                self.settings.MULTIPLIER_ENABLED and 
+                self.last_release_ns > 0 and 
+                ns_since_release < self._MULTIPLIER_THRESHOLD_NS
             )
             self._handle_slow_tap(use_multiplier)
         else:
@@ -151,36 +251,38 @@ class AcceleratingKeyHandler:
         
         # Start timer to detect if this becomes a HOLD (only if hold is enabled)
         # NOTE: If a burst is active, we defer starting the hold timer until
-        # the burst completes (see _on_burst_timer). This prevents hold detection
+        # the burst completes (see _finish_burst). This prevents hold detection
         # from cancelling the burst prematurely.
-        if self.HOLD_ENABLED and not self.burst_active:
+        if self.settings.HOLD_ENABLED and not self.burst_active:
+            self._timer_state = self._TIMER_HOLD
             self.timer.start(self.timer_interval)
     
     def _handle_slow_tap(self, use_multiplier: bool):
         """Handle tap with optional multiplier."""
         self.current_mode = InputMode.SLOW_TAP
+        self._interval_fn = self._tap_interval
         
+        burst_count, burst_interval, multiplied_count, multiplied_interval = self._tap_params
         if use_multiplier:
             # Apply multiplier: multiply burst count and use faster interval
-            burst_count = self.SLOW_BURST_COUNT * self.MULTIPLIER_BURST_COUNT
-            burst_interval = self.MULTIPLIER_BURST_INTERVAL
+            self._start_burst(multiplied_count, multiplied_interval)
         else:
             # Normal tap
-            burst_count = self.SLOW_BURST_COUNT
-            burst_interval = self.SLOW_BURST_INTERVAL
-        
-        self._start_burst(burst_count, burst_interval)
+            self._start_burst(burst_count, burst_interval)
     
     def _start_burst(self, burst_count, burst_interval):
         """Start a burst of rapid presses for tapping modes."""
         self.burst_remaining = burst_count
         self.burst_active = True
         self._current_burst_interval = burst_interval
+        self._current_burst_interval_ms = int(burst_interval * 1000)
         self._trigger_action()
         self.burst_remaining -= 1
         
         if self.burst_remaining > 0:
-            self.burst_timer.start(int(self._current_burst_interval * 1000))
+            # Repeating timer: started once here, handed over or stopped by _finish_burst
+            self._timer_state = self._TIMER_BURST
+            self.timer.start(self._current_burst_interval_ms)
         else:
             # Burst finished immediately (single press)
             self._finish_burst()
@@ -190,31 +292,32 @@ class AcceleratingKeyHandler:
         if self.burst_remaining > 0 and self.is_pressed:
             self._trigger_action()
             self.burst_remaining -= 1
-            
             if self.burst_remaining > 0:
-                self.burst_timer.start(int(self._current_burst_interval * 1000))
-            else:
-                # Burst complete
-                self._finish_burst()
-        else:
-            # Key was released during burst or no remaining
-            self._finish_burst()
+                return
+        
+        # Burst complete, key was released during burst or no remaining
+        self._finish_burst()
     
     def _finish_burst(self):
         """
         Called when a burst completes or is cancelled.
-        Clears burst state and optionally starts hold detection.
+        Clears burst state and either hands the timer over to hold detection
+        or stops it.
         """
         self.burst_active = False
         self.burst_remaining = 0
         
         # If key is still held and hold mode is enabled, start hold detection now
         # The hold timer will detect the transition to HOLD mode
-        if self.is_pressed and self.HOLD_ENABLED:
+        if self.is_pressed and self.settings.HOLD_ENABLED:
             # Reset timing for hold detection starting from now
-            self.press_start_time = time.time()
-            self.last_trigger_time = self.press_start_time
+            self.press_start_ns = self._clock.nsecsElapsed()
+            self.last_trigger_ns = self.press_start_ns
+            self._timer_state = self._TIMER_HOLD
             self.timer.start(self.timer_interval)
+        else:
+            self._timer_state = self._TIMER_IDLE
+            self.timer.stop()
     
     def end_press(self):
         """Called when the key is released."""
@@ -222,7 +325,7 @@ class AcceleratingKeyHandler:
             return
         
         self._cleanup_state()
-        self.last_release_time = time.time()
+        self.last_release_ns = self._clock.nsecsElapsed()
         self.is_pressed = False
     
     def force_stop(self, reason: str = ""):
@@ -232,50 +335,77 @@ class AcceleratingKeyHandler:
         """
         self._cleanup_state()
         self.is_pressed = False
-        # Don't update last_release_time on force stop to preserve tap timing logic
+        # Don't update last_release_ns on force stop to preserve tap timing logic
     
     def _cleanup_state(self):
         """Clean up all timers and state."""
         self.timer.stop()
-        self.burst_timer.stop()
+        self._timer_state = self._TIMER_IDLE
         self.burst_remaining = 0
         self.burst_active = False
         self.unchanged_trigger_count = 0
+        self._last_size_after = None
+        self._size_check_stride = 1
+        self._triggers_since_size_check = 0
+        self._cached_view = None
+        self._cached_action = None
     
     def _on_timer(self):
+        """Shared timer callback - dispatch to the burst or hold logic."""
+        state = self._timer_state
+        if state == self._TIMER_BURST:
+            self._on_burst_timer()
+        elif state == self._TIMER_HOLD:
+            self._on_hold_timer()
+        else:
+            self.timer.stop()
+    
+    def _on_hold_timer(self):
         """Timer callback - handle hold mode and acceleration."""
         if not self.is_pressed:
             self.timer.stop()
+            self._timer_state = self._TIMER_IDLE
             return
         
-        current_time = time.time()
-        elapsed_since_start = current_time - self.press_start_time
-        elapsed_since_trigger = current_time - self.last_trigger_time
+        now_ns = self._clock.nsecsElapsed()
+        elapsed_ns = now_ns - self.press_start_ns
+        elapsed_since_trigger_ns = now_ns - self.last_trigger_ns
         
         # === Safety Check 1: Maximum press duration timeout ===
-        if elapsed_since_start > self.MAX_PRESS_DURATION:
+        if elapsed_ns > self._MAX_PRESS_NS:
             self.force_stop("max press duration exceeded")
             return
         
         # Update timer activity tracking
-        self.last_timer_activity = current_time
+        self.last_timer_activity_ns = now_ns
         
         # Detect transition to HOLD mode (only if hold is enabled)
         # Don't transition if a burst is still active - let the burst complete first
-        if self.HOLD_ENABLED and elapsed_since_start >= self.HOLD_DETECT_TIME and self.current_mode != InputMode.HOLD and not self.burst_active:
+        if self.settings.HOLD_ENABLED and elapsed_ns >= self._HOLD_DETECT_NS and self.current_mode != InputMode.HOLD and not self.burst_active:
             # Switch to HOLD mode with exponential acceleration
             self.current_mode = InputMode.HOLD
+            self._interval_fn = self._make_hold_interval_fn()
         
         # Only continue timer processing if in HOLD mode
         if self.current_mode != InputMode.HOLD:
             return
         
         # Calculate interval based on current mode
-        interval = self._get_current_interval(elapsed_since_start)
+        interval_ns = self._interval_fn(elapsed_ns * 1e-9) * 1e9
+        remaining_ns = interval_ns - elapsed_since_trigger_ns
         
-        if elapsed_since_trigger >= interval:
+        if remaining_ns <= 0:
             self._trigger_action_with_safety_check()
-            self.last_trigger_time = current_time
+            self.last_trigger_ns = now_ns
+            if not self.is_pressed:
+                return  # Safety check stopped the handler
+            remaining_ns = self._interval_fn((elapsed_ns + interval_ns) * 1e-9) * 1e9
+        
+        # Wake up when the next trigger is due instead of polling every 5ms
+        # (start_press/_finish_burst restart at timer_interval for detection)
+        interval_ms = max(1, ceil(remaining_ns * 1e-6))
+        if interval_ms != self.timer.interval():
+            self.timer.setInterval(interval_ms)
     
     def is_stale_state(self) -> bool:
         """
@@ -285,12 +415,11 @@ class AcceleratingKeyHandler:
         if not self.is_pressed:
             return False
         
-        current_time = time.time()
-        time_since_activity = current_time - self.last_timer_activity
+        ns_since_activity = self._clock.nsecsElapsed() - self.last_timer_activity_ns
         
         # If we're supposedly pressed but haven't had timer activity in a while,
         # the state is stale
-        return time_since_activity > self.STALE_STATE_TIMEOUT
+        return ns_since_activity > self._STALE_NS
     
     def check_and_fix_stale_state(self):
         """
@@ -302,79 +431,128 @@ class AcceleratingKeyHandler:
             return True
         return False
     
-    def _get_current_interval(self, elapsed_time: float) -> float:
-        """Get the repeat interval based on current mode and elapsed time."""
+    def _make_hold_interval_fn(self):
+        """
+        Build the HOLD repeat interval function for the current settings.
         
-        if self.current_mode == InputMode.HOLD:
-            # HOLD: Exponential acceleration - very fast
-            # interval = base * e^(-k * t / tau)
-            t = elapsed_time - self.HOLD_DETECT_TIME
-            t = max(0, t)
-            decay = exp(-self.HOLD_EXP_K * t / self.HOLD_TAU)
-            interval = self.HOLD_BASE_INTERVAL * decay
-            return max(self.HOLD_MIN_INTERVAL, interval)
-        
-        else:  # SLOW_TAP
-            # TAP: Burst already handled, this is for if they keep holding
-            # after burst - transition to gentle acceleration
-            t = elapsed_time
-            accel = 1.0 + 1.5 * t
-            interval = 0.15 / accel
-            return max(0.03, interval)
-    
-    def _get_current_brush_size(self):
+        The returned function maps elapsed seconds to the interval without
+        branching on mode or reading settings attributes on each tick.
         """
-        Get the current brush size from Krita.
-        Returns None if unable to get the size.
+        # HOLD: Exponential acceleration - very fast
+        # interval = base * e^(-k * t / tau), looked up from the table
+        table = self._decay_table
+        table_len = len(table)
+        _, min_interval, _, detect = self._hold_params
+        step = self._decay_step
+        
+        def hold_interval(elapsed_time: float) -> float:
+            t = elapsed_time - detect
+            index = int(t / step) if t > 0 else 0
+            if index >= table_len:
+                return min_interval
+            return table[index]
+        
+        return hold_interval
+    
+    @staticmethod
+    def _tap_interval(elapsed_time: float) -> float:
+        """Repeat interval outside HOLD mode."""
+        # TAP: Burst already handled, this is for if they keep holding
+        # after burst - transition to gentle acceleration
+        accel = 1.0 + 1.5 * elapsed_time
+        interval = 0.15 / accel
+        return max(0.03, interval)
+    
+    def _cache_krita_objects(self):
+        """
+        Look up the active view and our action once at the start of a press,
+        so the timer callbacks don't walk Krita's object tree on every tick.
         """
+        self._cached_view = None
+        self._cached_action = None
         try:
             app = Krita.instance()
             if app:
-                view = app.activeWindow().activeView() if app.activeWindow() else None
-                if view:
-                    return view.brushSize()
+                window = app.activeWindow()
+                self._cached_view = window.activeView() if window else None
+                self._cached_action = app.action(self.action_name)
         except Exception:
             pass
-        return None
+    
+    def _get_current_brush_size(self):
+        """
+        Get the current brush size from the view cached for this press.
+        Returns None if unable to get the size.
+        """
+        view = self._cached_view
+        if view is None:
+            return None
+        try:
+            return view.brushSize()
+        except Exception:
+            return None
     
     def _trigger_action_with_safety_check(self):
         """
         Trigger the action with safety checks to prevent getting stuck.
         Stops if brush size is no longer changing (hit min/max limit).
         """
-        # Get brush size before triggering
-        size_before = self._get_current_brush_size()
+        # Get brush size before triggering. Consecutive HOLD triggers reuse
+        # the size read after the previous one instead of asking Krita again.
+        size_before = self._last_size_after
+        if size_before is None:
+            size_before = self._get_current_brush_size()
         
         # Trigger the actual action
         self._trigger_action()
         
+        # Once the size looks stuck, only read it every _size_check_stride
+        # triggers. The size only moves one way during a press, so an
+        # unchanged reading means every trigger since the last one was too.
+        self._triggers_since_size_check += 1
+        if self._triggers_since_size_check < self._size_check_stride:
+            return
+        triggers = self._triggers_since_size_check
+        self._triggers_since_size_check = 0
+        
         # Check if brush size changed (with small delay for Krita to process)
         size_after = self._get_current_brush_size()
+        self._last_size_after = size_after
         
         if size_before is not None and size_after is not None:
             # Check if size actually changed
             if abs(size_before - size_after) < 0.001:  # Essentially unchanged
-                self.unchanged_trigger_count += 1
+                self.unchanged_trigger_count += triggers
                 
                 # === Safety Check 2: Stop if brush size isn't changing ===
                 # This prevents getting stuck at min (1px) or max size
                 if self.unchanged_trigger_count >= self.MAX_UNCHANGED_TRIGGERS:
                     self.force_stop("brush size not changing")
                     return
+                
+                # Probe less often near the clamp, but never past the limit
+                stride = 8 if self.unchanged_trigger_count > 8 else 4 if self.unchanged_trigger_count > 3 else 1
+                self._size_check_stride = min(stride, self.MAX_UNCHANGED_TRIGGERS - self.unchanged_trigger_count)
             else:
                 # Size changed, reset counter
                 self.unchanged_trigger_count = 0
+                self._size_check_stride = 1
                 self.last_brush_size = size_after
     
     def _trigger_action(self):
-        """Trigger the actual brush size action in Krita."""
+        """
+        Trigger the actual brush size action in Krita.
+        
+        Each step goes through the action rather than view.setBrushSize():
+        Krita's increase/decrease actions walk its own table of brush sizes
+        instead of scaling by a fixed factor, so N steps can't be collapsed
+        into one computed size without drifting from what the keys would do.
+        """
         self.trigger_count += 1
         
-        app = Krita.instance()
-        if app:
-            action = app.action(self.action_name)
-            if action:
-                action.trigger()
+        action = self._cached_action
+        if action:
+            action.trigger()
 
 
 class BrushSizeAccelerationExtension(Extension):
@@ -394,10 +572,12 @@ class BrushSizeAccelerationExtension(Extension):
         
         # Handlers for each direction (per-window)
         self.window_handlers = {}
-        self.window_filters = {}
+        
+        # Key event filter shared by all windows (created with the first one)
+        self.key_event_filter = None
         
         # Get settings manager singleton
-        self.settings_manager = SettingsManager.instance()
+        self.settings_manager = settings_manager.instance()
     
     def setup(self):
         """Called once when Krita starts."""
@@ -460,13 +640,9 @@ class BrushSizeAccelerationExtension(Extension):
         # Get the window's QWidget to install event filter
         qwindow = window.qwindow()
         if qwindow:
-            event_filter = BrushSizeKeyEventFilter(
-                decrease_handler,
-                increase_handler,
-                qwindow
-            )
-            qwindow.installEventFilter(event_filter)
-            self.window_filters[id(window)] = event_filter
+            if self.key_event_filter is None:
+                self.key_event_filter = BrushSizeKeyEventFilter()
+            self.key_event_filter.add_window(qwindow, decrease_handler, increase_handler)
     
     def _on_action_triggered(self, handler):
         """
@@ -485,7 +661,7 @@ class BrushSizeAccelerationExtension(Extension):
                 handler.start_press()
 
 
-from PyQt5.QtCore import QObject, QEvent, Qt
+from PyQt5.QtCore import QObject, QEvent
 from PyQt5.QtGui import QKeyEvent, QKeySequence
 
 
@@ -493,23 +669,59 @@ class BrushSizeKeyEventFilter(QObject):
     """
     Event filter to capture key press and release events for the
     accelerating brush size shortcuts.
+    
+    One filter is shared by every Krita window: it is installed on each
+    window and picks that window's handler pair from the watched object.
     """
     
-    def __init__(self, decrease_handler, increase_handler, parent=None):
+    # Positions in each window's (decrease_handler, increase_handler) pair
+    _DECREASE = 0
+    _INCREASE = 1
+    
+    # Mask to extract just the key code without modifiers
+    KEY_MASK = 0x01FFFFFF  # Qt key codes are in the lower bits
+    
+    # Modifier bits shared by QKeyEvent and QKeySequence, and the keys that
+    # are themselves modifiers (never part of a shortcut on their own)
+    _MOD_MASK = int(Qt.ShiftModifier | Qt.ControlModifier | Qt.AltModifier | Qt.MetaModifier)
+    _MODIFIER_KEYS = frozenset((Qt.Key_Shift, Qt.Key_Control, Qt.Key_Alt, Qt.Key_Meta))
+    
+    # The only event types eventFilter acts on; everything else is passed
+    # straight through
+    _WATCHED_TYPES = frozenset((QEvent.KeyPress, QEvent.KeyRelease, QEvent.FocusOut, QEvent.WindowDeactivate))
+    
+    # Backoff between failed shortcut scans: 20ms, 40ms, ... capped at 1s
+    _SHORTCUT_RETRY_BASE_NS = 10_000_000
+    _SHORTCUT_RETRY_MAX_NS = 1_000_000_000
+    
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.decrease_handler = decrease_handler
-        self.increase_handler = increase_handler
         
-        # Track which keys are mapped to our actions
+        # Handler pair for each window this filter is installed on
+        self._handlers_by_window = {}
+        
+        # Map shortcut key combos to the handler position they drive, plus the
+        # bare key codes to their positions for the ignoring-modifiers fallback.
+        # Shortcuts are shared by all windows, so one scan serves them all.
         # These will be detected dynamically from the action shortcuts
-        self.decrease_keys = set()
-        self.increase_keys = set()
+        self._combo_to_index = {}
+        self._key_only_to_indices = {}
         
         # Track currently pressed keys to avoid auto-repeat
         self.pressed_keys = set()
         
-        # Delay initial shortcut detection
-        self._shortcuts_loaded = False
+        # Delay initial shortcut detection; while no shortcuts are assigned,
+        # rescan with exponential backoff instead of on every event
+        self._shortcut_retry_at_ns = 0
+        self._shortcut_retries = 0
+        
+        # Event counter so the stale-handler check only runs every 128 events
+        self._stale_check_counter = 0
+    
+    def add_window(self, qwindow, decrease_handler, increase_handler):
+        """Start filtering a window's events for its pair of handlers."""
+        self._handlers_by_window[qwindow] = (decrease_handler, increase_handler)
+        qwindow.installEventFilter(self)
     
     def _update_shortcut_keys(self):
         """Update the tracked shortcut keys from Krita's action system."""
@@ -518,32 +730,33 @@ class BrushSizeKeyEventFilter(QObject):
             return False
         
         try:
-            # Get decrease action shortcuts
-            decrease_action = app.action("accel_decrease_brush_size")
-            if decrease_action:
-                shortcuts = decrease_action.shortcuts()
-                self.decrease_keys = set()
-                for shortcut in shortcuts:
+            combo_to_index = {}
+            key_only_to_indices = {}
+            
+            # Increase first so decrease wins if a combo is bound to both
+            for action_name, index in (
+                ("accel_increase_brush_size", self._INCREASE),
+                ("accel_decrease_brush_size", self._DECREASE),
+            ):
+                action = app.action(action_name)
+                if not action:
+                    continue
+                for shortcut in action.shortcuts():
                     if not shortcut.isEmpty():
                         # Convert QKeySequence to comparable key+modifiers
                         # QKeySequence[0] gives us the combined key+modifiers as int
                         key_combo = int(shortcut[0]) if len(shortcut) > 0 else 0
                         if key_combo:
-                            self.decrease_keys.add(key_combo)
+                            combo_to_index[key_combo] = index
+                            key_only = key_combo & self.KEY_MASK
+                            indices = key_only_to_indices.get(key_only, ())
+                            if index not in indices:
+                                # Decrease is added last but checked first
+                                key_only_to_indices[key_only] = (index,) + indices
             
-            # Get increase action shortcuts
-            increase_action = app.action("accel_increase_brush_size")
-            if increase_action:
-                shortcuts = increase_action.shortcuts()
-                self.increase_keys = set()
-                for shortcut in shortcuts:
-                    if not shortcut.isEmpty():
-                        key_combo = int(shortcut[0]) if len(shortcut) > 0 else 0
-                        if key_combo:
-                            self.increase_keys.add(key_combo)
-            
-            self._shortcuts_loaded = bool(self.decrease_keys or self.increase_keys)
-            return self._shortcuts_loaded
+            self._combo_to_index = combo_to_index
+            self._key_only_to_indices = key_only_to_indices
+            return bool(combo_to_index)
             
         except Exception as e:
             # Silently fail - shortcuts might not be assigned yet
@@ -552,42 +765,48 @@ class BrushSizeKeyEventFilter(QObject):
     def _get_key_combo(self, key_event):
         """Get a comparable key combination from a key event."""
         key = key_event.key()
-        modifiers = key_event.modifiers()
         
         # Filter out just the modifier keys themselves
-        if key in (Qt.Key_Shift, Qt.Key_Control, Qt.Key_Alt, Qt.Key_Meta):
+        if key in self._MODIFIER_KEYS:
             return None
         
-        # Combine key with modifiers for comparison
-        # Need to convert Qt.KeyboardModifiers to int and mask properly
-        mod_int = int(modifiers)
-        
-        # Qt uses different bits for modifiers in QKeySequence vs QKeyEvent
-        # Map the modifier flags appropriately
-        combo = key
-        if mod_int & Qt.ShiftModifier:
-            combo |= Qt.ShiftModifier
-        if mod_int & Qt.ControlModifier:
-            combo |= Qt.ControlModifier
-        if mod_int & Qt.AltModifier:
-            combo |= Qt.AltModifier
-        if mod_int & Qt.MetaModifier:
-            combo |= Qt.MetaModifier
-        
-        return combo
+        # Combine key with modifiers for comparison. The Shift/Control/Alt/Meta
+        # bits are the same in QKeyEvent and QKeySequence, so one mask keeps
+        # just those (dropping e.g. KeypadModifier) as a plain int
+        return key | (int(key_event.modifiers()) & self._MOD_MASK)
     
     def eventFilter(self, obj, event):
         """Filter key events to handle press/release for our shortcuts."""
         
-        # Lazy load shortcuts on first key event
-        if not self._shortcuts_loaded:
-            self._update_shortcut_keys()
+        # === Periodic stale state check, every 128 events of any type ===
+        # This helps catch and fix stale states that might have been missed.
+        # Counted before the type check so mouse traffic keeps it ticking;
+        # _on_action_triggered also checks before every new press.
+        self._stale_check_counter = (self._stale_check_counter + 1) & 127
+        if self._stale_check_counter == 0:
+            self._check_stale_handlers()
+        
+        # Bail out before any other work for the mouse/paint/timer events
+        # that make up most of the window's traffic
+        event_type = event.type()
+        if event_type not in self._WATCHED_TYPES:
+            return False
         
-        # === Periodic stale state check on any key event ===
-        # This helps catch and fix stale states that might have been missed
-        self._check_stale_handlers()
+        handlers = self._handlers_by_window.get(obj)
+        if handlers is None:
+            return False
         
-        if event.type() == QEvent.KeyPress:
+        # Lazy load shortcuts on first key event, backing off while none are assigned
+        if not self._combo_to_index:
+            now_ns = time.monotonic_ns()
+            if now_ns >= self._shortcut_retry_at_ns and not self._update_shortcut_keys():
+                self._shortcut_retries = min(self._shortcut_retries + 1, 30)
+                self._shortcut_retry_at_ns = now_ns + min(
+                    self._SHORTCUT_RETRY_MAX_NS,
+                    self._SHORTCUT_RETRY_BASE_NS << self._shortcut_retries,
+                )
+        
+        if event_type == QEvent.KeyPress:
             key_event = event
             
             # Get comparable key combination
@@ -595,24 +814,21 @@ class BrushSizeKeyEventFilter(QObject):
             if key_combo is None:
                 return False
             
-            # Ignore auto-repeat events
-            if key_event.isAutoRepeat():
-                if key_combo in self.decrease_keys or key_combo in self.increase_keys:
-                    return True  # Consume the auto-repeat
+            index = self._combo_to_index.get(key_combo)
+            if index is None:
                 return False
             
-            # Check if this matches our shortcuts
-            if key_combo in self.decrease_keys and key_combo not in self.pressed_keys:
-                self.pressed_keys.add(key_combo)
-                self.decrease_handler.start_press()
-                return True  # Consume the event
+            # Consume auto-repeat events for our shortcuts
+            if key_event.isAutoRepeat():
+                return True
             
-            elif key_combo in self.increase_keys and key_combo not in self.pressed_keys:
+            # Check if this matches our shortcuts
+            if key_combo not in self.pressed_keys:
                 self.pressed_keys.add(key_combo)
-                self.increase_handler.start_press()
+                handlers[index].start_press()
                 return True  # Consume the event
         
-        elif event.type() == QEvent.KeyRelease:
+        elif event_type == QEvent.KeyRelease:
             key_event = event
             
             # Ignore auto-repeat events
@@ -628,63 +844,42 @@ class BrushSizeKeyEventFilter(QObject):
             # Qt's shortcut system consumes KeyPress events before they reach us,
             # so pressed_keys tracking via KeyPress doesn't work for bound shortcuts.
             # The handler.is_pressed flag is set by triggered() signal instead.
-            if key_combo in self.decrease_keys and self.decrease_handler.is_pressed:
-                self.pressed_keys.discard(key_combo)
-                self.decrease_handler.end_press()
-                return True
-            
-            elif key_combo in self.increase_keys and self.increase_handler.is_pressed:
+            index = self._combo_to_index.get(key_combo)
+            if index is not None and handlers[index].is_pressed:
                 self.pressed_keys.discard(key_combo)
-                self.increase_handler.end_press()
+                handlers[index].end_press()
                 return True
             
             # === Fallback: If a handler is pressed but key doesn't match exactly ===
             # This catches cases where modifier state changed between press and release
-            key_only = key_event.key()
-            if self._key_in_set_ignoring_modifiers(key_only, self.decrease_keys) and self.decrease_handler.is_pressed:
-                self.pressed_keys.discard(key_combo)
-                self.decrease_handler.end_press()
-                return True
-            
-            elif self._key_in_set_ignoring_modifiers(key_only, self.increase_keys) and self.increase_handler.is_pressed:
-                self.pressed_keys.discard(key_combo)
-                self.increase_handler.end_press()
-                return True
+            for index in self._key_only_to_indices.get(key_event.key(), ()):
+                handler = handlers[index]
+                if handler.is_pressed:
+                    self.pressed_keys.discard(key_combo)
+                    handler.end_press()
+                    return True
         
         # Handle focus loss - release all keys
-        elif event.type() == QEvent.FocusOut:
-            self._release_all_keys()
+        elif event_type == QEvent.FocusOut:
+            self._release_all_keys(handlers)
         
         # Handle window deactivation
-        elif event.type() == QEvent.WindowDeactivate:
-            self._release_all_keys()
+        elif event_type == QEvent.WindowDeactivate:
+            self._release_all_keys(handlers)
         
         return False  # Don't consume other events
     
-    def _release_all_keys(self):
+    def _release_all_keys(self, handlers):
         """Release all currently pressed keys on focus loss or window deactivation."""
         # Use handler state instead of pressed_keys, since pressed_keys tracking
         # may be incomplete when shortcuts consume KeyPress events
-        if self.decrease_handler.is_pressed:
-            self.decrease_handler.end_press()
-        if self.increase_handler.is_pressed:
-            self.increase_handler.end_press()
+        for handler in handlers:
+            if handler.is_pressed:
+                handler.end_press()
         self.pressed_keys.clear()
     
     def _check_stale_handlers(self):
         """Check for and fix any stale handler states."""
-        self.decrease_handler.check_and_fix_stale_state()
-        self.increase_handler.check_and_fix_stale_state()
-    
-    def _key_in_set_ignoring_modifiers(self, key: int, key_set: set) -> bool:
-        """
-        Check if a key (without modifiers) matches any key in the set.
-        This is a fallback for when modifier state changes between press and release.
-        """
-        # Mask to extract just the key code without modifiers
-        key_mask = 0x01FFFFFF  # Qt key codes are in the lower bits
-        
-        for combo in key_set:
-            if (combo & key_mask) == key:
-                return True
-        return False
+        for handlers in self._handlers_by_window.values():
+            for handler in handlers:
+                handler.check_and_fix_stale_state()
@@ -9,9 +9,23 @@ Manages all configurable timing thresholds and speeds with support for:
 - Threshold toggle states (enable/disable modes)
 """
 
+import json
+import weakref
+from contextlib import contextmanager
+
 from krita import Krita
 
 
+def _parse_bool(value_str):
+    """Parse a boolean setting stored as a string."""
+    return value_str.lower() in ('true', '1', 'yes')
+
+
+def _parse_int(value_str):
+    """Parse an integer setting stored as a string (may be written as a float)."""
+    return int(float(value_str))
+
+
 class SettingsManager:
     """
     Centralized settings manager for Quick Brush Size plugin.
@@ -23,6 +37,10 @@ class SettingsManager:
     # Settings group name for Krita's settings system
     SETTINGS_GROUP = "QuickBrushSize"
     
+    # Key holding all settings as one JSON object (older versions stored
+    # one key per setting; those are read once and migrated)
+    _SERIALIZED_KEY = "all_json"
+    
     # === DEFAULT VALUES (Original Plugin Presets) ===
     DEFAULTS = {
         # Timing Thresholds
@@ -50,6 +68,18 @@ class SettingsManager:
         "multiplier_burst_interval": 0.001,  # Burst interval when multiplier is active
     }
     
+    # Fixed key order for the value tuples in _saved and _before_reset
+    _KEYS = tuple(DEFAULTS)
+    
+    # Type of each setting, taken from its default
+    _VALUE_TYPES = {key: type(default) for key, default in DEFAULTS.items()}
+    
+    # Parser for each setting's stored string form (legacy per-key storage)
+    _TYPE_CASTERS = {
+        key: _parse_bool if value_type is bool else _parse_int if value_type is int else float
+        for key, value_type in _VALUE_TYPES.items()
+    }
+    
     # === SETTING METADATA (for UI) ===
     # Format: (display_name, min_value, max_value, decimals, step, tooltip)
     SETTING_META = {
@@ -117,6 +147,9 @@ class SettingsManager:
         ),
     }
     
+    # (min_value, max_value) for each setting that has UI metadata
+    _BOUNDS = {key: (meta[1], meta[2]) for key, meta in SETTING_META.items()}
+    
     # Threshold keys that can be toggled (map to their enabled setting key)
     THRESHOLD_TOGGLE_MAP = {
         "hold_detect_time": "hold_enabled",
@@ -124,55 +157,102 @@ class SettingsManager:
         "multiplier_threshold": "multiplier_enabled",
     }
     
-    # Group settings by mode for UI organization
+    # Setting keys holding the enabled state of a threshold
+    _ENABLED_KEYS = frozenset(THRESHOLD_TOGGLE_MAP.values())
+    
+    # SettingsSnapshot attribute, setting key and type for each setting
+    # handlers read (as handler.settings.<attribute>)
+    _HANDLER_ATTR_MAP = (
+        # Timing Thresholds
+        ("HOLD_DETECT_TIME", "hold_detect_time", float),
+        ("SLOW_TAP_THRESHOLD", "slow_tap_threshold", float),
+        ("MULTIPLIER_THRESHOLD", "multiplier_threshold", float),
+        
+        # Enabled states for modes
+        ("HOLD_ENABLED", "hold_enabled", bool),
+        ("SLOW_TAP_ENABLED", "slow_tap_enabled", bool),
+        ("MULTIPLIER_ENABLED", "multiplier_enabled", bool),
+        
+        ("HOLD_BASE_INTERVAL", "hold_base_interval", float),
+        ("HOLD_MIN_INTERVAL", "hold_min_interval", float),
+        ("HOLD_EXP_K", "hold_exp_k", float),
+        ("HOLD_TAU", "hold_tau", float),
+        
+        ("SLOW_BURST_COUNT", "slow_burst_count", int),
+        ("SLOW_BURST_INTERVAL", "slow_burst_interval", float),
+        
+        ("MULTIPLIER_BURST_COUNT", "multiplier_burst_count", int),
+        ("MULTIPLIER_BURST_INTERVAL", "multiplier_burst_interval", float),
+    )
+    
+    # Group settings by mode for UI organization (read-only key tuples)
     SETTING_GROUPS = {
-        "Timing Thresholds": [
+        "Timing Thresholds": (
             "hold_detect_time",
             "slow_tap_threshold",
             "multiplier_threshold",
-        ],
-        "Holding Mode": [
+        ),
+        "Holding Mode": (
             "hold_base_interval",
             "hold_min_interval",
             "hold_exp_k",
             "hold_tau",
-        ],
-        "Tapping Mode": [
+        ),
+        "Tapping Mode": (
             "slow_burst_count",
             "slow_burst_interval",
-        ],
-        "Double Tap Multiplier": [
+        ),
+        "Double Tap Multiplier": (
             "multiplier_burst_count",
             "multiplier_burst_interval",
-        ],
+        ),
     }
     
-    # Singleton instance
-    _instance = None
-    
     @classmethod
     def instance(cls):
-        """Get the singleton instance of SettingsManager."""
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        """Get the singleton instance of SettingsManager (see instance())."""
+        return instance()
     
     def __init__(self):
         """Initialize settings manager with current values."""
         # Current settings (in memory)
         self._current = dict(self.DEFAULTS)
         
-        # Last saved settings (for Cancel functionality)
-        self._saved = dict(self.DEFAULTS)
+        # Last saved settings (for Cancel functionality), as a _values_tuple() tuple
+        self._saved = self._values_tuple()
         
-        # State before Reset to Default (for Cancel after Reset)
+        # State before Reset to Default (for Cancel after Reset), as a _values_tuple() tuple
         self._before_reset = None
         
-        # Registered handlers to update when settings change
-        self._handlers = []
+        # True when _current may differ from what was last saved
+        self._dirty = False
+        
+        # Registered handlers to update when settings change (weakly held, so
+        # a handler that is never unregistered doesn't outlive its window)
+        self._handlers = weakref.WeakSet()
+        
+        # Nesting depth of batch_update() and whether an update was held back
+        self._batching = 0
+        self._pending_update = False
         
-        # Load saved settings from Krita
-        self._load_from_krita()
+        # Number of enabled thresholds, kept in sync with _current
+        self._enabled_count = self._count_enabled_thresholds()
+        
+        # Saved settings are loaded from Krita on first use (see _ensure_loaded)
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """
+        Load saved settings from Krita the first time they are needed.
+        
+        Constructing the manager no longer reads Krita's settings, but
+        register_handler() loads them too, and the extension registers its
+        handlers in createActions(). The read is therefore moved from
+        construction to window creation, not taken off startup.
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._load_from_krita()
     
     def _load_from_krita(self):
         """Load settings from Krita's persistent storage."""
@@ -180,6 +260,30 @@ class SettingsManager:
         if not app:
             return
         
+        blob = app.readSetting(self.SETTINGS_GROUP, self._SERIALIZED_KEY, "")
+        try:
+            stored = json.loads(blob) if blob else None
+        except ValueError:
+            stored = None
+        
+        if isinstance(stored, dict):
+            for key, default in self.DEFAULTS.items():
+                try:
+                    self._current[key] = self._coerce(key, stored.get(key, default))
+                except (ValueError, TypeError):
+                    self._current[key] = default
+        else:
+            # No (valid) blob yet: read the legacy per-key settings and
+            # write them back as a blob so this only happens once
+            self._load_legacy_from_krita(app)
+            self._save_to_krita()
+        
+        # Update saved state to match loaded settings
+        self._saved = self._values_tuple()
+        self._enabled_count = self._count_enabled_thresholds()
+    
+    def _load_legacy_from_krita(self, app):
+        """Load settings stored under one Krita setting key each."""
         for key, default in self.DEFAULTS.items():
             try:
                 value_str = app.readSetting(
@@ -188,17 +292,9 @@ class SettingsManager:
                     str(default)
                 )
                 # Convert to appropriate type
-                if isinstance(default, bool):
-                    self._current[key] = value_str.lower() in ('true', '1', 'yes')
-                elif isinstance(default, int):
-                    self._current[key] = int(float(value_str))
-                else:
-                    self._current[key] = float(value_str)
+                self._current[key] = self._TYPE_CASTERS[key](value_str)
             except (ValueError, TypeError):
                 self._current[key] = default
-        
-        # Update saved state to match loaded settings
-        self._saved = dict(self._current)
     
     def _save_to_krita(self):
         """Save current settings to Krita's persistent storage."""
@@ -206,39 +302,83 @@ class SettingsManager:
         if not app:
             return False
         
-        for key, value in self._current.items():
-            app.writeSetting(
-                self.SETTINGS_GROUP,
-                key,
-                str(value)
-            )
+        app.writeSetting(
+            self.SETTINGS_GROUP,
+            self._SERIALIZED_KEY,
+            json.dumps(self._current, separators=(',', ':'))
+        )
         return True
     
     def get(self, key):
         """Get the current value for a setting."""
+        self._ensure_loaded()
         return self._current.get(key, self.DEFAULTS.get(key))
     
     def set(self, key, value):
         """
         Set a setting value (live update, not persisted yet).
         
-        Updates all registered handlers immediately.
+        Values are clamped to the setting's SETTING_META range. Updates all
+        registered handlers immediately, unless the value is unchanged.
+        """
+        self._ensure_loaded()
+        current = self._current.get(key)
+        if current is None:
+            return
+        
+        value = self._coerce(key, value)
+        bounds = self._BOUNDS.get(key)
+        if bounds is not None:
+            low, high = bounds
+            if value < low:
+                value = self._coerce(key, low)
+            elif value > high:
+                value = self._coerce(key, high)
+        
+        if value == current:
+            return  # No-op (e.g. a redundant valueChanged from the UI)
+        
+        self._current[key] = value
+        self._dirty = True
+        if key in self._ENABLED_KEYS:
+            self._enabled_count += 1 if value else -1
+        self._update_handlers()
+    
+    def set_many(self, values):
+        """
+        Set several setting values at once (live update, not persisted yet).
+        
+        Handlers are updated once for the whole batch rather than per key.
+        Unknown keys are ignored.
         """
-        if key in self._current:
-            # Convert to appropriate type based on default
-            default = self.DEFAULTS.get(key)
-            if isinstance(default, bool):
-                value = bool(value)
-            elif isinstance(default, int):
-                value = int(value)
-            else:
-                value = float(value)
-            
-            self._current[key] = value
-            self._update_handlers()
+        with self.batch_update():
+            for key, value in values.items():
+                self.set(key, value)
+    
+    @contextmanager
+    def batch_update(self):
+        """
+        Hold back handler updates until the outermost batch ends.
+        
+        Any number of changes made inside the block reach the handlers as
+        a single update on exit.
+        """
+        self._batching += 1
+        try:
+            yield
+        finally:
+            self._batching -= 1
+            if self._batching == 0 and self._pending_update:
+                self._pending_update = False
+                self._update_handlers()
+    
+    def _coerce(self, key, value):
+        """Convert a value to the type of the setting's default."""
+        return self._VALUE_TYPES.get(key, float)(value)
     
     def is_threshold_enabled(self, threshold_key):
         """Check if a threshold/mode is enabled."""
+        self._ensure_loaded()
         enabled_key = self.THRESHOLD_TOGGLE_MAP.get(threshold_key)
         if enabled_key:
             return self._current.get(enabled_key, True)
@@ -246,32 +386,59 @@ class SettingsManager:
     
     def set_threshold_enabled(self, threshold_key, enabled):
         """Set whether a threshold/mode is enabled."""
+        self._ensure_loaded()
         enabled_key = self.THRESHOLD_TOGGLE_MAP.get(threshold_key)
-        if enabled_key:
-            self._current[enabled_key] = bool(enabled)
-            self._update_handlers()
+        if not enabled_key:
+            return
+        
+        enabled = bool(enabled)
+        if enabled == self._current.get(enabled_key, True):
+            return
+        
+        self._enabled_count += 1 if enabled else -1
+        self._dirty = True
+        self._current[enabled_key] = enabled
+        self._update_handlers()
     
     def get_enabled_threshold_count(self):
         """Get the count of currently enabled thresholds."""
+        self._ensure_loaded()
+        return self._enabled_count
+    
+    def _count_enabled_thresholds(self):
+        """Count the enabled thresholds in the current settings."""
         count = 0
         for enabled_key in self.THRESHOLD_TOGGLE_MAP.values():
             if self._current.get(enabled_key, True):
                 count += 1
         return count
     
+    def _values_tuple(self):
+        """Get the current values as a tuple in _KEYS order."""
+        current = self._current
+        return tuple([current[key] for key in self._KEYS])
+    
     def get_all(self):
         """Get a copy of all current settings."""
+        self._ensure_loaded()
         return dict(self._current)
     
     def save(self):
         """
         Save current settings to persistent storage.
         
-        Returns True if successful.
+        Returns True if successful. Nothing is written when the settings
+        haven't changed since the last save.
         """
+        self._ensure_loaded()
+        if not self._dirty:
+            self._before_reset = None  # Clear reset state on save
+            return True
+        
         if self._save_to_krita():
-            self._saved = dict(self._current)
+            self._saved = self._values_tuple()
             self._before_reset = None  # Clear reset state on save
+            self._dirty = False
             return True
         return False
     
@@ -281,14 +448,17 @@ class SettingsManager:
         
         If Reset to Default was clicked, this also reverts the reset.
         """
+        self._ensure_loaded()
         if self._before_reset is not None:
             # Revert the Reset to Default operation
-            self._current = dict(self._before_reset)
+            self._current = dict(zip(self._KEYS, self._before_reset))
             self._before_reset = None
         else:
             # Just revert to last saved
-            self._current = dict(self._saved)
+            self._current = dict(zip(self._KEYS, self._saved))
         
+        self._dirty = self._values_tuple() != self._saved
+        self._enabled_count = self._count_enabled_thresholds()
         self._update_handlers()
     
     def reset_to_defaults(self):
@@ -297,12 +467,15 @@ class SettingsManager:
         
         Saves the current state so Cancel can undo this.
         """
+        self._ensure_loaded()
         # Store current state before reset (for Cancel)
-        self._before_reset = dict(self._current)
+        self._before_reset = self._values_tuple()
         
         # Apply defaults
         self._current = dict(self.DEFAULTS)
         
+        self._dirty = self._values_tuple() != self._saved
+        self._enabled_count = self._count_enabled_thresholds()
         self._update_handlers()
     
     def get_default(self, key):
@@ -311,39 +484,67 @@ class SettingsManager:
     
     def register_handler(self, handler):
         """Register a handler to receive setting updates."""
+        self._ensure_loaded()
         if handler not in self._handlers:
-            self._handlers.append(handler)
+            self._handlers.add(handler)
             self._apply_to_handler(handler)
     
     def unregister_handler(self, handler):
         """Unregister a handler from setting updates."""
-        if handler in self._handlers:
-            self._handlers.remove(handler)
+        self._handlers.discard(handler)
     
     def _update_handlers(self):
         """Update all registered handlers with current settings."""
-        for handler in self._handlers:
-            self._apply_to_handler(handler)
+        if self._batching:
+            self._pending_update = True
+            return
+        
+        snapshot = SettingsSnapshot.from_settings(self._current)
+        for handler in list(self._handlers):
+            self._apply_to_handler(handler, snapshot)
     
-    def _apply_to_handler(self, handler):
+    def _apply_to_handler(self, handler, snapshot=None):
         """Apply current settings to a specific handler."""
-        # Map setting keys to handler attributes
-        handler.HOLD_DETECT_TIME = self._current["hold_detect_time"]
-        handler.SLOW_TAP_THRESHOLD = self._current["slow_tap_threshold"]
-        handler.MULTIPLIER_THRESHOLD = self._current["multiplier_threshold"]
-        
-        # Enabled states for modes
-        handler.HOLD_ENABLED = self._current["hold_enabled"]
-        handler.SLOW_TAP_ENABLED = self._current["slow_tap_enabled"]
-        handler.MULTIPLIER_ENABLED = self._current["multiplier_enabled"]
-        
-        handler.HOLD_BASE_INTERVAL = self._current["hold_base_interval"]
-        handler.HOLD_MIN_INTERVAL = self._current["hold_min_interval"]
-        handler.HOLD_EXP_K = self._current["hold_exp_k"]
-        handler.HOLD_TAU = self._current["hold_tau"]
+        if snapshot is None:
+            snapshot = SettingsSnapshot.from_settings(self._current)
         
-        handler.SLOW_BURST_COUNT = int(self._current["slow_burst_count"])
-        handler.SLOW_BURST_INTERVAL = self._current["slow_burst_interval"]
+        # Handlers share one read-only snapshot, swapped in as a whole
+        handler.settings = snapshot
         
-        handler.MULTIPLIER_BURST_COUNT = int(self._current["multiplier_burst_count"])
-        handler.MULTIPLIER_BURST_INTERVAL = self._current["multiplier_burst_interval"]
+        # Let the handler refresh anything derived from these settings
+        handler.on_settings_changed()
+
+
+class SettingsSnapshot:
+    """
+    Immutable view of the settings handlers use, as upper-case attributes
+    (HOLD_DETECT_TIME, SLOW_BURST_COUNT, ...).
+    
+    SettingsManager builds one per change and hands the same object to
+    every handler, so a handler never sees a half-applied update.
+    """
+    
+    __slots__ = tuple(attr for attr, _, _ in SettingsManager._HANDLER_ATTR_MAP)
+    
+    @classmethod
+    def from_settings(cls, values):
+        """Build a snapshot from a dict of setting key -> value."""
+        snapshot = object.__new__(cls)
+        for attr, key, caster in SettingsManager._HANDLER_ATTR_MAP:
+            object.__setattr__(snapshot, attr, caster(values[key]))
+        return snapshot
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot is read-only")
+
+
+def _create_instance():
+    """Create the singleton, then rebind instance() to just return it."""
+    global instance
+    inst = SettingsManager()
+    instance = lambda: inst
+    return inst
+
+
+# Get the singleton SettingsManager (no None check after the first call)
+instance = _create_instance